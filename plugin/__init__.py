@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import sublime
+
 from .auto_file_path import (
     AfpDeletePrefixedSlash,
     AfpSettingsPanel,
@@ -7,6 +9,8 @@ from .auto_file_path import (
     FileNameComplete,
     InsertDimensionsCommand,
     ReloadAutoCompleteCommand,
+    on_settings_changed,
+    warm_up,
 )
 
 __all__ = (
@@ -16,12 +20,19 @@ __all__ = (
     "FileNameComplete",
     "InsertDimensionsCommand",
     "ReloadAutoCompleteCommand",
+    # plugin hooks, which Sublime Text only finds in what `boot.py` imports
+    "plugin_loaded",
+    "plugin_unloaded",
 )
 
 
 def plugin_loaded() -> None:
     """Executed when this plugin is loaded."""
+    # keep this cheap, anything heavier goes to the async thread
+    sublime.load_settings("AutoFilePath.sublime-settings").add_on_change(__package__, on_settings_changed)
+    sublime.set_timeout_async(warm_up)
 
 
 def plugin_unloaded() -> None:
     """Executed when this plugin is unloaded."""
+    sublime.load_settings("AutoFilePath.sublime-settings").clear_on_change(__package__)
@@ -1,22 +1,135 @@
 from __future__ import annotations
 
-import ctypes
-import itertools
 import os
 import re
-import string
 import time
-from typing import Any
+from typing import Any, Callable, Iterator
 
 import sublime
 import sublime_plugin
 
 from .context import get_context
-from .libs.filesize import naturalsize
-from .libs.image_info import getImageInfo
+from .fs_cache import (
+    DirListing,
+    EntryInfo,
+    Identity,
+    cache_set,
+    canonical_path,
+    file_signature,
+    get_image_size,
+    scan_dir,
+)
 
 g_auto_completions: list[sublime.CompletionItem] = []
 MAXIMUM_WAIT_TIME = 0.3
+MAXIMUM_COMPLETION_STREAMS = 16
+# seconds after which a fully built stream is rebuilt in the background, since file sizes in it are not revalidated
+MAXIMUM_STREAM_AGE = 5.0
+# seconds of work per callback when rebuilding a stream, since the async thread is shared by all plugins
+STREAM_REFRESH_BATCH_TIME = 0.02
+
+# (directory identity, st_mtime_ns, path separator) => stream
+g_completion_streams: dict[tuple[Identity, int, str], CompletionStream] = {}
+# item lists merged into `g_auto_completions` with how many of their items are merged, so that re-querying the
+# same directories only merges items built since then, or None if `g_auto_completions` holds anything else
+g_merged_sources: list[tuple[list[sublime.CompletionItem], int]] | None = None
+g_merged_triggers: set[str] = set()
+
+
+class CompletionStream:
+    """Completion items of a directory, built on demand so that later queries resume where the last one stopped."""
+
+    def __init__(self, items: Iterator[sublime.CompletionItem | None]) -> None:
+        self.iterator = items
+        self.items: list[sublime.CompletionItem] = []
+        self.is_done = False
+        self.done_time = 0.0
+        self.is_refreshing = False
+        # insertion replacements => items with them applied
+        self.replaced_items: dict[str, list[sublime.CompletionItem]] = {}
+
+    def advance(self, deadline: float) -> bool:
+        """
+        Builds items until all are built or the deadline is reached. Returns whether all are built.
+        `None` from the iterator means the next item cannot be built yet, which also ends this call.
+        """
+        while not self.is_done and time.time() < deadline:
+            try:
+                item = next(self.iterator)
+            except StopIteration:
+                self.is_done = True
+                self.done_time = time.time()
+                break
+            if item is None:
+                break
+            self.items.append(item)
+        return self.is_done
+
+    def get_items(self, replacements: list[list[str]] | None) -> list[sublime.CompletionItem]:
+        """Returns built items with `replace_on_insert` replacements applied to their completions."""
+        if not replacements:
+            return self.items
+
+        items = self.replaced_items.setdefault(repr(replacements), [])
+        for item in self.items[len(items) :]:
+            items.append(
+                sublime.CompletionItem(
+                    trigger=item.trigger,
+                    annotation=item.annotation,
+                    # the completion of a built item is its trigger
+                    completion=apply_replacements(item.trigger, replacements),
+                    completion_format=item.completion_format,
+                    kind=item.kind,
+                    details=item.details,
+                )
+            )
+        return items
+
+
+def refresh_completion_stream_async(key: tuple[Identity, int, str], stream: CompletionStream) -> None:
+    """Builds `stream` in short batches in the async thread, then makes it replace the stream of `key`."""
+
+    def run_batch() -> None:
+        if not stream.advance(time.time() + STREAM_REFRESH_BATCH_TIME):
+            sublime.set_timeout_async(run_batch)
+        elif key in g_completion_streams:
+            cache_set(g_completion_streams, key, stream, MAXIMUM_COMPLETION_STREAMS)
+
+    sublime.set_timeout_async(run_batch)
+
+
+def merge_completions(sources: list[list[sublime.CompletionItem]], extra_items: list[sublime.CompletionItem]) -> None:
+    """Fills `g_auto_completions` with `extra_items` and items of `sources` whose triggers are not taken yet."""
+    global g_merged_sources
+
+    merged_sources = g_merged_sources
+    if (
+        extra_items
+        or merged_sources is None
+        or len(merged_sources) != len(sources)
+        or any(merged is not source for (merged, _), source in zip(merged_sources, sources))
+    ):
+        g_auto_completions[:] = extra_items
+        g_merged_triggers.clear()
+        merged_sources = [(source, 0) for source in sources]
+
+    for i, (source, merged) in enumerate(merged_sources):
+        for item in source[merged:]:
+            # merged results from other directories may already have it
+            if item.trigger not in g_merged_triggers:
+                g_merged_triggers.add(item.trigger)
+                g_auto_completions.append(item)
+        merged_sources[i] = (source, len(source))
+
+    # `g_auto_completions` holds more than the merged sources if there are extra items
+    g_merged_sources = None if extra_items else merged_sources
+
+
+def invalidate_merged_completions() -> None:
+    """Makes the next `merge_completions()` start over, for when `g_auto_completions` is changed elsewhere."""
+    global g_merged_sources
+
+    g_merged_sources = None
 
 
 def get_setting(string, view: sublime.View | None = None) -> Any:
@@ -26,9 +139,10 @@ def get_setting(string, view: sublime.View | None = None) -> Any:
         return sublime.load_settings("AutoFilePath.sublime-settings").get(string)
 
 
-def get_cur_scope_settings(view: sublime.View):
-    selection = view.sel()[0].a
-    current_scope_str = view.scope_name(selection)
+def get_cur_scope_settings(view: sublime.View, point: int | None = None):
+    if point is None:
+        point = view.sel()[0].a
+    current_scope_str = view.scope_name(point)
 
     all_scopes_settings = get_setting("afp_scopes", view)
     for scope_settings in all_scopes_settings:
@@ -55,13 +169,10 @@ def apply_alias_replacements(entered_path, aliases) -> str | None:
     return result_path if result_path != entered_path else None
 
 
-def apply_post_replacements(view, insertion_text: str) -> str:
-    cur_scope_settings = get_cur_scope_settings(view)
-    if cur_scope_settings:
-        replace_on_insert_setting = cur_scope_settings.get("replace_on_insert")
-        if replace_on_insert_setting:
-            for replace in replace_on_insert_setting:
-                insertion_text = re.sub(replace[0], replace[1], insertion_text)
+def apply_replacements(insertion_text: str, replace_on_insert_setting: list[list[str]] | None) -> str:
+    if replace_on_insert_setting:
+        for replace in replace_on_insert_setting:
+            insertion_text = re.sub(replace[0], replace[1], insertion_text)
     return insertion_text
 
 
@@ -106,10 +217,18 @@ class AfpDeletePrefixedSlash(sublime_plugin.TextCommand):
 # inserts width and height dimensions into img tags. HTML only
 class InsertDimensionsCommand(sublime_plugin.TextCommand):
     this_dir = ""
+    # the completed directory of each caret, in the order of selections
+    caret_dirs: list[str] = []
 
-    def insert_dimension(self, edit: sublime.Edit, dim: int, name: str, tag_scope: sublime.Region) -> None:
+    def insert_dimension(
+        self,
+        edit: sublime.Edit,
+        dim: int,
+        name: str,
+        tag_scope: sublime.Region,
+        selection: int,
+    ) -> None:
         view = self.view
-        selection = view.sel()[0].a
 
         if name in view.substr(tag_scope):
             reg = view.find("(?<=" + name + r'=)\s*"\d{1,5}', tag_scope.a)
@@ -118,15 +237,15 @@ class InsertDimensionsCommand(sublime_plugin.TextCommand):
             dimension = str(dim)
             view.insert(edit, selection + 1, " " + name + '="' + dimension + '"')
 
-    def insert_dimensions(self, edit: sublime.Edit, scope: sublime.Region, w: int, h: int) -> None:
+    def insert_dimensions(self, edit: sublime.Edit, scope: sublime.Region, w: int, h: int, selection: int) -> None:
         view = self.view
 
         if get_setting("afp_insert_width_first", view):
-            self.insert_dimension(edit, h, "height", scope)
-            self.insert_dimension(edit, w, "width", scope)
+            self.insert_dimension(edit, h, "height", scope, selection)
+            self.insert_dimension(edit, w, "width", scope, selection)
         else:
-            self.insert_dimension(edit, w, "width", scope)
-            self.insert_dimension(edit, h, "height", scope)
+            self.insert_dimension(edit, w, "width", scope, selection)
+            self.insert_dimension(edit, h, "height", scope, selection)
 
     # determines if there is a template tag in a given region.  supports HTML and template languages.
     def is_img_tag_in_region(self, region: sublime.Region) -> bool:
@@ -139,7 +258,14 @@ class InsertDimensionsCommand(sublime_plugin.TextCommand):
     def run(self, edit: sublime.Edit) -> None:
         view = self.view
         view.run_command("commit_completion")
-        selection = view.sel()[0].a
+
+        # from the last caret so that insertions won't shift the positions of the remaining ones
+        for index, region in reversed(tuple(enumerate(view.sel()))):
+            this_dir = self.caret_dirs[index] if index < len(self.caret_dirs) else self.this_dir
+            self.insert_dimensions_at(edit, region.a, this_dir)
+
+    def insert_dimensions_at(self, edit: sublime.Edit, selection: int, this_dir: str) -> None:
+        view = self.view
 
         if "html" not in view.scope_name(selection):
             return
@@ -155,14 +281,11 @@ class InsertDimensionsCommand(sublime_plugin.TextCommand):
             path = path[1:-1]
 
         path = path[path.rfind(FileNameComplete.sep) :] if FileNameComplete.sep in path else path
-        full_path = self.this_dir + path
+        full_path = this_dir + path
 
         if self.is_img_tag_in_region(tag_scope) and path.endswith((".png", ".jpg", ".jpeg", ".gif")):
-            with open(full_path, "rb") as r:
-                read_data = r.read() if path.endswith((".jpg", ".jpeg")) else r.read(24)
-            w, h = getImageInfo(read_data)
-
-            self.insert_dimensions(edit, tag_scope, w, h)
+            if image_size := get_image_size(full_path):
+                self.insert_dimensions(edit, tag_scope, *image_size, selection)
 
 
 # When backspacing through a path, selects the previous path component
@@ -171,15 +294,51 @@ class ReloadAutoCompleteCommand(sublime_plugin.TextCommand):
         view = self.view
         view.run_command("hide_auto_complete")
         view.run_command("left_delete")
-        selection = view.sel()[0].a
 
-        scope = view.extract_scope(selection - 1)
-        scope_text = view.substr(scope)
-        slash_pos = scope_text[: selection - scope.a].rfind(FileNameComplete.sep)
-        slash_pos += 1 if slash_pos < 0 else 0
+        regions: list[sublime.Region] = []
+        for selection in (region.a for region in view.sel()):
+            scope = view.extract_scope(selection - 1)
+            scope_text = view.substr(scope)
+            slash_pos = scope_text[: selection - scope.a].rfind(FileNameComplete.sep)
+            slash_pos += 1 if slash_pos < 0 else 0
+
+            regions.append(sublime.Region(scope.a + slash_pos + 1, selection))
+
+        view.sel().add_all(regions)
+
 
-        region = sublime.Region(scope.a + slash_pos + 1, selection)
-        view.sel().add(region)
+def warm_heading_index(view: sublime.View) -> None:
+    """Indexes headings of markdown files in the background so anchor completions are instant."""
+    if not ((window := view.window()) and view.match_selector(0, "text.html.markdown")):
+        return
+
+    from .heading_index import warm_folder_async
+
+    file_name = view.file_name() or ""
+    for folder in window.folders():
+        if file_name.startswith(os.path.join(folder, "")):
+            warm_folder_async(folder)
+            break
+    else:
+        if file_name:
+            warm_folder_async(os.path.dirname(file_name))
+
+
+def warm_up() -> None:
+    """Loads deferred modules ahead of the first completion. Meant to be run in the async thread."""
+    from .libs import filesize, image_info  # noqa: F401
+
+    if sublime.platform() == "windows":
+        import ctypes  # noqa: F401
+
+    if view := sublime.active_window().active_view():
+        warm_heading_index(view)
+
+
+def on_settings_changed() -> None:
+    # completion items are built according to settings so cached ones may be outdated now
+    g_completion_streams.clear()
+    invalidate_merged_completions()
 
 
 def enable_autocomplete() -> None:
@@ -204,18 +363,25 @@ class FileNameComplete(sublime_plugin.ViewEventListener):
     def __init__(self, view: sublime.View) -> None:
         super().__init__(view)
         self.showing_win_drives = False
+        self.is_incomplete = False
 
     def on_activated(self) -> None:
         self.showing_win_drives = False
         self.sep = "/"
         self.is_active = False
 
+    def on_activated_async(self) -> None:
+        warm_heading_index(self.view)
+
     def on_query_context(self, key: str, operator: str, operand: str, match_all: bool) -> bool:
         view = self.view
 
         if key == "afp_deleting_slash":  # for reloading autocomplete
-            selection = view.sel()[0]
-            valid = self.at_path_end(view) and selection.empty() and view.substr(selection.a - 1) == self.sep
+            checks = (
+                self.at_path_end(view, selection.a) and selection.empty() and view.substr(selection.a - 1) == self.sep
+                for selection in view.sel()
+            )
+            valid = all(checks) if match_all else any(checks)
             return valid == operand
 
         if key == "afp_use_keybinding":
@@ -233,25 +399,19 @@ class FileNameComplete(sublime_plugin.ViewEventListener):
 
         if not (is_always_enabled or self.is_forced or self.is_active):
             return
-        caret = view.sel()[0].a
 
-        valid_scopes = self.get_setting("afp_valid_scopes", view)
-        blacklist = self.get_setting("afp_blacklist_scopes", view)
-
-        if (
-            # ...
-            not any(view.match_selector(caret, scope) for scope in valid_scopes)
-            or any(view.match_selector(caret, scope) for scope in blacklist)
-        ):
+        if not any(map(self.is_valid_scope, locations)):
             return
 
-        self.view = view
-        self.caret = caret
-
         self.start_time = time.time()
-        self.add_completions()
+        self.add_completions(locations)
+
+        flags = sublime.INHIBIT_WORD_COMPLETIONS | sublime.INHIBIT_EXPLICIT_COMPLETIONS
+        if self.is_incomplete:
+            # re-queried while typing, which continues building the remaining items
+            flags |= sublime.DYNAMIC_COMPLETIONS
 
-        return g_auto_completions, sublime.INHIBIT_WORD_COMPLETIONS | sublime.INHIBIT_EXPLICIT_COMPLETIONS
+        return g_auto_completions, flags
 
     def on_modified_async(self) -> None:
         view = self.view
@@ -299,8 +459,8 @@ class FileNameComplete(sublime_plugin.ViewEventListener):
         else:
             self.is_active = False
 
-    def at_path_end(self, view: sublime.View) -> bool:
-        selection = view.sel()[0]
+    def at_path_end(self, view: sublime.View, point: int | None = None) -> bool:
+        selection = view.sel()[0] if point is None else sublime.Region(point)
         name = view.scope_name(selection.a)
 
         if selection.empty() and ("string.end" in name or "string.quoted.end.js" in name):
@@ -311,8 +471,15 @@ class FileNameComplete(sublime_plugin.ViewEventListener):
 
         return False
 
-    def prepare_completion(self, view: sublime.View, this_dir: str, directory: str) -> sublime.CompletionItem:
-        path = os.path.join(this_dir, directory)
+    @staticmethod
+    def prepare_completion(
+        this_dir: str,
+        directory: str,
+        entry: EntryInfo,
+        format_size: Callable[[int], str] = str,
+    ) -> sublime.CompletionItem:
+        """Builds the completion item of a directory entry, without `replace_on_insert` replacements."""
+        path = os.path.join(this_dir, entry.name)
 
         annotation = ""
         annotation_head = ""
@@ -320,38 +487,82 @@ class FileNameComplete(sublime_plugin.ViewEventListener):
         details_head = ""
         details_parts = []
 
-        if os.path.isdir(path):
+        if entry.is_dir:
             annotation = "Dir"
             annotation_head = "📁"
             annotation_head_kind = sublime.KIND_ID_MARKUP
             details_head = "Directory"
-        elif os.path.isfile(path):
+        elif entry.is_file:
             annotation = "File"
             annotation_head = "📄"
             annotation_head_kind = sublime.KIND_ID_MARKUP
             details_head = "File"
-            details_parts.append("Size: " + naturalsize(os.stat(path).st_size))
+            try:
+                st: os.stat_result | None = os.stat(path)
+            except OSError:
+                st = None
+            if st:
+                details_parts.append("Size: " + format_size(st.st_size))
 
-        if path.endswith((".gif", ".jpeg", ".jpg", ".png")):
+        if entry.is_file and path.endswith((".gif", ".jpeg", ".jpg", ".png")):
             details_head = "Image"
 
-            with open(path, "rb") as f:
-                read_data = f.read() if path.endswith((".jpeg", ".jpg")) else f.read(24)
-
-            try:
-                w, h = getImageInfo(read_data)
+            if st and (image_size := get_image_size(path, file_signature(st))):
+                w, h = image_size
                 details_parts.extend((f"Height: {h}", f"Width: {w}"))
-            except Exception:
-                pass
 
         return sublime.CompletionItem(
             trigger=directory,
             annotation=annotation,
-            completion=apply_post_replacements(view, directory),
+            completion=directory,
             kind=(annotation_head_kind, annotation_head, details_head),
             details=", ".join(details_parts),
         )
 
+    def add_anchors(
+        self,
+        caret: int,
+        this_dir: str,
+        listed: set[str | Identity],
+        items: list[sublime.CompletionItem],
+    ) -> bool:
+        """Adds heading anchors of the markdown file in the entered path like `foo.md#`. Returns whether handled."""
+        if not self.view.match_selector(caret, "text.html.markdown meta.link.inline"):
+            return False
+
+        entered_path = self.get_entered_path(self.view, caret)
+        file_part = entered_path[entered_path.rfind(self.sep) + 1 :]
+        if "#" not in file_part:
+            return False
+
+        from .heading_index import get_headings, is_markdown_file
+
+        file_part = file_part[: file_part.find("#")]
+        if file_part:
+            md_path = os.path.join(this_dir, file_part)
+        elif not entered_path.startswith("#") or not (md_path := self.view.file_name() or ""):
+            return False
+
+        if not is_markdown_file(md_path):
+            return False
+
+        if (md_path := canonical_path(md_path)) in listed:
+            return True
+        listed.add(md_path)
+
+        for slug, heading in get_headings(md_path):
+            items.append(
+                sublime.CompletionItem(
+                    trigger=slug,
+                    annotation="Heading",
+                    completion=slug,
+                    kind=(sublime.KIND_ID_MARKUP, "#", "Heading"),
+                    details=heading,
+                )
+            )
+
+        return True
+
     def get_entered_path(self, view: sublime.View, selection: int) -> str:
         scope_contents = view.substr(view.extract_scope(selection - 1)).strip()
         cur_path = scope_contents.replace("\r\n", "\n").split("\n")[0]
@@ -376,6 +587,10 @@ class FileNameComplete(sublime_plugin.ViewEventListener):
         if sublime.platform() != "windows":
             return
 
+        import ctypes
+        import itertools
+        import string
+
         drive_bitmask = ctypes.cdll.kernel32.GetLogicalDrives()
         drive_list = list(
             itertools.compress(string.ascii_uppercase, map(lambda x: ord(x) - ord("0"), bin(drive_bitmask)[:1:-1]))
@@ -397,28 +612,139 @@ class FileNameComplete(sublime_plugin.ViewEventListener):
             if time.time() - self.start_time > MAXIMUM_WAIT_TIME:
                 return
 
-    def add_completions(self) -> None:
-        g_auto_completions.clear()
+    def is_valid_scope(self, caret: int) -> bool:
+        view = self.view
+        valid_scopes = self.get_setting("afp_valid_scopes", view)
+        blacklist = self.get_setting("afp_blacklist_scopes", view)
+
+        return any(view.match_selector(caret, scope) for scope in valid_scopes) and not any(
+            view.match_selector(caret, scope) for scope in blacklist
+        )
+
+    def add_completions(self, carets: list[int]) -> None:
+        self.showing_win_drives = False
+        self.is_incomplete = False
+        deadline = self.start_time + MAXIMUM_WAIT_TIME
+
+        caret_dirs: list[str] = []
+        listed: set[str | Identity] = set()
+        sources: list[list[sublime.CompletionItem]] = []
+        anchors: list[sublime.CompletionItem] = []
+
+        for caret in carets:
+            this_dir = self.get_this_dir(caret)
+            caret_dirs.append(this_dir or "")
+            if this_dir is None:
+                continue
 
-        ctx = get_context(self.view)
+            try:
+                if self.add_anchors(caret, this_dir, listed, anchors):
+                    continue
+
+                # carets in the same physical directory, however it is spelled, share a single listing
+                identity, mtime_ns, listing = scan_dir(this_dir, deadline)
+                if identity in listed:
+                    continue
+                listed.add(identity)
+
+                stream = self.get_completion_stream(this_dir, identity, mtime_ns, listing)
+                if not stream.advance(deadline):
+                    self.is_incomplete = True
+
+                # replacements are those of the current caret, which may differ from when items were built
+                scope_settings = get_cur_scope_settings(self.view, caret) or {}
+                sources.append(stream.get_items(scope_settings.get("replace_on_insert")))
+                InsertDimensionsCommand.this_dir = this_dir
+            except OSError:
+                pass
+
+        InsertDimensionsCommand.caret_dirs = caret_dirs
+
+        merge_completions(sources, anchors)
+
+        if self.showing_win_drives:
+            invalidate_merged_completions()
+            self.add_drives()
+
+    def get_completion_stream(
+        self,
+        this_dir: str,
+        identity: Identity,
+        mtime_ns: int,
+        listing: DirListing,
+    ) -> CompletionStream:
+        # read once, since the stream may be resumed by another view whose separator differs
+        sep = self.sep
+        key = (identity, mtime_ns, sep)
+
+        stream = g_completion_streams.get(key)
+        if not stream:
+            stream = CompletionStream(self.iter_completions(this_dir, listing, sep))
+            cache_set(g_completion_streams, key, stream, MAXIMUM_COMPLETION_STREAMS)
+        elif stream.is_done and not stream.is_refreshing and time.time() - stream.done_time > MAXIMUM_STREAM_AGE:
+            # built items are still served meanwhile, so a large directory is never listed partially again
+            stream.is_refreshing = True
+            refresh_completion_stream_async(key, CompletionStream(self.iter_completions(this_dir, listing, sep)))
+
+        return stream
+
+    @staticmethod
+    def iter_completions(
+        this_dir: str,
+        listing: DirListing,
+        sep: str,
+    ) -> Iterator[sublime.CompletionItem | None]:
+        """
+        Builds completion items lazily, yielding `None` while waiting for `listing` to be scanned further.
+        Streams are shared by views so nothing is read from the listener.
+        """
+        from .libs.filesize import naturalsize
+
+        index = 0
+        while True:
+            # read before the entries, which are all scanned once it is set
+            is_complete = listing.is_complete
+            if index == len(listing.entries):
+                if is_complete:
+                    return
+                yield None
+                continue
+
+            entry = listing.entries[index]
+            index += 1
+
+            directory = entry.name
+            if directory.startswith("."):
+                continue
+
+            if "." not in directory:
+                directory += sep
+
+            yield FileNameComplete.prepare_completion(this_dir, directory, entry, naturalsize)
+
+    def get_this_dir(self, caret: int) -> str | None:
+        """Resolves the directory to be listed for `caret`. Returns `None` if there is none."""
+        if not self.is_valid_scope(caret):
+            return None
+
+        ctx = get_context(self.view, caret)
         if not ctx["is_valid"]:
-            return
+            return None
 
-        scope_settings = get_cur_scope_settings(self.view)
+        scope_settings = get_cur_scope_settings(self.view, caret)
         if scope_settings and scope_settings.get("prefixes") and ctx["prefix"]:
             if ctx["prefix"] not in scope_settings.get("prefixes"):
-                return
+                return None
 
         file_name = self.view.file_name()
         is_proj_rel = self.get_setting("afp_use_project_root", self.view)
 
         this_dir = ""
-        cur_path = os.path.expanduser(self.get_cur_path(self.view, self.caret))
+        cur_path = os.path.expanduser(self.get_cur_path(self.view, caret))
 
         if cur_path.startswith("\\\\") and not cur_path.startswith("\\\\\\") and sublime.platform() == "windows":
             self.showing_win_drives = True
-            self.add_drives()
-            return
+            return None
         elif cur_path.startswith(("/", "\\")):
             if is_proj_rel and file_name:
                 proot = self.get_setting("afp_proj_root", self.view)
@@ -436,38 +762,17 @@ class FileNameComplete(sublime_plugin.ViewEventListener):
             this_dir = os.path.join(this_dir, cur_path)
 
             if scope_settings and scope_settings.get("aliases"):
-                entered_path = self.get_entered_path(self.view, self.caret)
+                entered_path = self.get_entered_path(self.view, caret)
                 result_path = apply_alias_replacements(entered_path, scope_settings.get("aliases"))
                 if result_path:
                     this_dir = re.sub(r"[^/]+$", "", result_path)
 
-        try:
-            if os.path.isabs(cur_path) and (not is_proj_rel or not this_dir):
-                if sublime.platform() == "windows" and len(self.view.extract_scope(self.caret)) < 4:
-                    self.showing_win_drives = True
-                    self.add_drives()
-                    return
-
-                if sublime.platform() != "windows":
-                    this_dir = cur_path
-
-            self.showing_win_drives = False
-            dir_files = os.listdir(this_dir)
-
-            now = time.time()
+        if os.path.isabs(cur_path) and (not is_proj_rel or not this_dir):
+            if sublime.platform() == "windows" and len(self.view.extract_scope(caret)) < 4:
+                self.showing_win_drives = True
+                return None
 
-            for directory in dir_files:
-                if directory.startswith("."):
-                    continue
-
-                if "." not in directory:
-                    directory += self.sep
-
-                g_auto_completions.append(self.prepare_completion(self.view, this_dir, directory))
-                InsertDimensionsCommand.this_dir = this_dir
-
-                if now - self.start_time > MAXIMUM_WAIT_TIME:
-                    return
+            if sublime.platform() != "windows":
+                this_dir = cur_path
 
-        except OSError:
-            pass
+        return this_dir
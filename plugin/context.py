@@ -16,16 +16,16 @@ NEEDLE_INVALID_CHARACTERS = r"\"\'\)=\(<>\n\{\}"
 DELIMITER = r"\s\:\(\[\=\{"
 
 
-def get_context(view: sublime.View) -> dict[str, Any]:
-    if not (sel := view.sel()):
-        return {}
+def get_context(view: sublime.View, position: int | None = None) -> dict[str, Any]:
+    if position is None:
+        if not (sel := view.sel()):
+            return {}
+        position = sel[0].begin()
 
     error = False
     valid = True
     valid_needle = True
 
-    position = sel[0].begin()
-
     # regions
     line_region = view.line(position)
     word_region = view.word(position)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Iterator, NamedTuple, Tuple, TypeVar, Union
+
+import sublime
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+# (st_dev, st_ino) of a file or directory, which is the same however the path is spelled
+# (st_dev, normalized path) where inode numbers are not available, like some Windows network drives
+Identity = Tuple[int, Union[int, str]]
+# (st_dev, st_ino, st_mtime_ns, st_size) of a file, which changes whenever it is modified
+Signature = Tuple[int, int, int, int]
+
+
+class EntryInfo(NamedTuple):
+    name: str
+    is_dir: bool
+    is_file: bool
+
+
+class DirListing:
+    """Entries of a directory. While it is incomplete, the remaining entries are being scanned."""
+
+    def __init__(self) -> None:
+        self.entries: list[EntryInfo] = []
+        self.is_complete = False
+
+    def scan(self, it: Iterator[os.DirEntry], deadline: float | None = None) -> bool:
+        """Scans entries of the `os.scandir()` iterator `it` until the deadline. Returns whether all are scanned."""
+        try:
+            for entry in it:
+                self.entries.append(scan_entry(entry))
+                if deadline is not None and time.time() >= deadline:
+                    return False
+        except OSError:
+            pass
+
+        it.close()  # type: ignore[attr-defined]
+        self.is_complete = True
+        return True
+
+
+MAXIMUM_CANONICAL_PATHS = 1024
+MAXIMUM_LISTINGS = 64
+MAXIMUM_IMAGE_SIZES = 1024
+# the coarsest mtime resolution of common filesystems (FAT), within which a directory may change unnoticed
+MTIME_RESOLUTION_NS = 2_000_000_000
+
+# normalized path => (identity, real path)
+g_canonical_cache: dict[str, tuple[Identity, str]] = {}
+# identity => (st_mtime_ns, scanned time in ns, listing)
+g_listing_cache: dict[Identity, tuple[int, int, DirListing]] = {}
+# file signature => (width, height) or None if not an image
+g_image_size_cache: dict[Signature, tuple[int, int] | None] = {}
+
+
+def cache_set(cache: dict[_K, _V], key: _K, value: _V, max_size: int) -> _V:
+    """Stores `value` into a size-limited cache, evicting the oldest entries when it is full."""
+    cache.pop(key, None)
+    while len(cache) >= max_size:
+        del cache[next(iter(cache))]
+    cache[key] = value
+    return value
+
+
+def file_signature(st: os.stat_result) -> Signature:
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def file_identity(path: str, st: os.stat_result) -> Identity:
+    if st.st_ino:
+        return (st.st_dev, st.st_ino)
+    return (st.st_dev, os.path.normcase(os.path.normpath(os.path.abspath(path))))
+
+
+def canonical_path(path: str, st: os.stat_result | None = None) -> str:
+    """
+    Returns the real path of `path` with symlinks and `..` resolved. The `realpath()` result is cached and
+    reused as long as the path still points to the same file, which is checked if its `stat()` is given.
+    """
+    path = os.path.normpath(os.path.abspath(path))
+    cached = g_canonical_cache.get(path)
+    if cached and (st is None or cached[0] == file_identity(path, st)):
+        return cached[1]
+
+    try:
+        if st is None:
+            st = os.stat(path)
+    except OSError:
+        return path
+
+    real_path = os.path.realpath(path)
+    cache_set(g_canonical_cache, path, (file_identity(path, st), real_path), MAXIMUM_CANONICAL_PATHS)
+    return real_path
+
+
+def scan_dir(path: str, deadline: float | None = None) -> tuple[Identity, int, DirListing]:
+    """
+    Lists names and types of a directory's entries, as `(identity, st_mtime_ns, listing)`.
+
+    Entries are scanned until the deadline and the remaining ones in the async thread, which makes the listing
+    incomplete meanwhile. The listing is cached and shared by all paths reaching the same directory, costing only
+    a `stat()` while the directory is unchanged. Sizes and modification times of entries are not cached since
+    editing a file does not change its directory. Raises `OSError`.
+    """
+    st = os.stat(path)
+    identity = file_identity(path, st)
+
+    if (cached := g_listing_cache.get(identity)) and cached[0] == st.st_mtime_ns:
+        _, scanned_ns, listing = cached
+        # with coarse timestamps, a change right after the scan may not have changed the mtime
+        if not listing.is_complete or scanned_ns - st.st_mtime_ns >= MTIME_RESOLUTION_NS:
+            return identity, st.st_mtime_ns, listing
+
+    scanned_ns = time.time_ns()
+    it = os.scandir(path)
+    listing = DirListing()
+    cache_set(g_listing_cache, identity, (st.st_mtime_ns, scanned_ns, listing), MAXIMUM_LISTINGS)
+
+    # the handle is closed once scanned, which matters on Windows where it prevents renaming the directory
+    if not listing.scan(it, deadline):
+        sublime.set_timeout_async(lambda: listing.scan(it))
+
+    return identity, st.st_mtime_ns, listing
+
+
+def scan_entry(entry: os.DirEntry) -> EntryInfo:
+    try:
+        # only symlinks and unknown file types cost a `stat()` here
+        return EntryInfo(entry.name, entry.is_dir(), entry.is_file())
+    except OSError:
+        return EntryInfo(entry.name, False, False)
+
+
+def get_image_size(path: str, signature: Signature | None = None) -> tuple[int, int] | None:
+    """Returns `(width, height)` of an image file, read only once per version of the file."""
+    if signature is None:
+        try:
+            signature = file_signature(os.stat(path))
+        except OSError:
+            return None
+
+    if signature in g_image_size_cache:
+        return g_image_size_cache[signature]
+
+    from .libs.image_info import getImageInfo
+
+    size: tuple[int, int] | None = None
+    try:
+        with open(path, "rb") as f:
+            read_data = f.read() if path.endswith((".jpeg", ".jpg")) else f.read(24)
+        w, h = getImageInfo(read_data)
+        if w > 0 and h > 0:
+            size = (w, h)
+    except Exception:
+        pass
+
+    return cache_set(g_image_size_cache, signature, size, MAXIMUM_IMAGE_SIZES)
+
+
+def walk_unique(folder: str) -> Iterator[tuple[str, list[str], list[str]]]:
+    """
+    Like `os.walk()` but follows symlinks which stay within `folder`, visiting each physical directory once so
+    that loops end. Symlinks out of `folder` are skipped since they may reach anything, like the home directory.
+    """
+    real_folder = os.path.join(os.path.realpath(folder), "")
+    visited: set[Identity] = set()
+    for root, dirs, files in os.walk(folder, followlinks=True):
+        try:
+            st = os.stat(root)
+        except OSError:
+            dirs.clear()
+            continue
+
+        if (identity := file_identity(root, st)) in visited:
+            dirs.clear()
+            continue
+        visited.add(identity)
+
+        dirs[:] = [
+            d
+            for d in dirs
+            if not os.path.islink(path := os.path.join(root, d))
+            or os.path.join(os.path.realpath(path), "").startswith(real_folder)
+        ]
+        yield root, dirs, files
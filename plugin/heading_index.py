@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+from typing import Iterator
+
+import sublime
+
+from .fs_cache import cache_set, canonical_path, walk_unique
+
+MARKDOWN_EXTENSIONS = (".md", ".markdown", ".mdown", ".mkd", ".mkdn")
+MAXIMUM_HEADING_FILES = 4096
+# seconds of work per callback when warming a folder, since the async thread is shared by all plugins
+WARM_UP_BATCH_TIME = 0.02
+
+# real path => ((st_mtime_ns, st_size), ((slug, heading text), ...))
+g_heading_cache: dict[str, tuple[tuple[int, int], tuple[tuple[str, str], ...]]] = {}
+g_warmed_folders: set[str] = set()
+
+ATX_HEADING_RE = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+SETEXT_UNDERLINE_RE = re.compile(r"^ {0,3}(?:=+|-+)[ \t]*$")
+FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})(.*)$")
+FRONT_MATTER_START_RE = re.compile(r"^---[ \t]*$")
+FRONT_MATTER_END_RE = re.compile(r"^(?:---|\.\.\.)[ \t]*$")
+INLINE_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+SLUG_INVALID_CHARS_RE = re.compile(r"[^\w\- ]", re.UNICODE)
+
+
+def is_markdown_file(path: str) -> bool:
+    return path.lower().endswith(MARKDOWN_EXTENSIONS)
+
+
+def slugify(heading: str) -> str:
+    """Converts a heading into an anchor the same way GitHub does."""
+    heading = INLINE_LINK_RE.sub(r"\1", heading)
+    heading = SLUG_INVALID_CHARS_RE.sub("", heading.strip().lower())
+    return heading.replace(" ", "-")
+
+
+def iter_headings(path: str) -> Iterator[str]:
+    """Yields heading texts of a markdown file, reading it line by line."""
+    fence = ""
+    prev_line = ""
+    in_front_matter = False
+
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line_no, line in enumerate(f):
+            line = line.rstrip("\r\n")
+
+            # YAML front matter, as used by Jekyll, Hugo, Docusaurus...
+            if line_no == 0 and FRONT_MATTER_START_RE.match(line):
+                in_front_matter = True
+                continue
+            if in_front_matter:
+                in_front_matter = not FRONT_MATTER_END_RE.match(line)
+                continue
+
+            if m := FENCE_RE.match(line):
+                if not fence:
+                    fence = m.group(1)
+                # a closing fence is at least as long as the opening one and has no info string
+                elif m.group(1).startswith(fence) and not m.group(2).strip():
+                    fence = ""
+                prev_line = ""
+                continue
+
+            if fence:
+                continue
+
+            if m := ATX_HEADING_RE.match(line):
+                if m.group(2):
+                    yield m.group(2)
+                prev_line = ""
+                continue
+
+            if prev_line.strip() and SETEXT_UNDERLINE_RE.match(line) and not prev_line.startswith((" " * 4, "\t")):
+                yield prev_line.strip()
+                prev_line = ""
+                continue
+
+            prev_line = line
+
+
+def parse_headings(path: str) -> tuple[tuple[str, str], ...]:
+    """Returns `(slug, heading text)` pairs of a markdown file with GitHub-style duplicated slug suffixes."""
+    seen: dict[str, int] = {}
+    headings: list[tuple[str, str]] = []
+
+    for heading in iter_headings(path):
+        slug = base_slug = slugify(heading)
+        if base_slug in seen:
+            seen[base_slug] += 1
+            slug = f"{base_slug}-{seen[base_slug]}"
+        else:
+            seen[base_slug] = 0
+        headings.append((slug, heading))
+
+    return tuple(headings)
+
+
+def get_headings(path: str) -> tuple[tuple[str, str], ...]:
+    """Returns `(slug, heading text)` pairs of a markdown file, re-parsing it only when it has been changed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ()
+
+    # files reached via different paths (symlinks, `..`) share the same entry
+    path = canonical_path(path, st)
+
+    signature = (st.st_mtime_ns, st.st_size)
+    if (cached := g_heading_cache.get(path)) and cached[0] == signature:
+        return cached[1]
+
+    try:
+        headings = parse_headings(path)
+    except OSError:
+        return ()
+
+    cache_set(g_heading_cache, path, (signature, headings), MAXIMUM_HEADING_FILES)
+    return headings
+
+
+def iter_warm_folder(folder: str) -> Iterator[None]:
+    """
+    Parses headings of all markdown files under `folder` so that later lookups are just a `stat()`.
+    Yields after each parsed file and listed directory so that the work can be split into batches.
+    """
+    for root, dirs, files in walk_unique(folder):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d != "node_modules"]
+        for file in files:
+            # warming a huge folder should not evict files which are actually used
+            if len(g_heading_cache) >= MAXIMUM_HEADING_FILES:
+                return
+            if is_markdown_file(file):
+                get_headings(os.path.join(root, file))
+                yield
+        yield
+
+
+def warm_folder(folder: str) -> None:
+    for _ in iter_warm_folder(folder):
+        pass
+
+
+def warm_folder_async(folder: str) -> None:
+    if not folder or folder in g_warmed_folders:
+        return
+
+    g_warmed_folders.add(folder)
+    steps = iter_warm_folder(folder)
+
+    def run_batch() -> None:
+        deadline = time.time() + WARM_UP_BATCH_TIME
+        for _ in steps:
+            if time.time() >= deadline:
+                # let other callbacks in the async thread run before continuing
+                sublime.set_timeout_async(run_batch)
+                return
+
+    sublime.set_timeout_async(run_batch)
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import itertools
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import sublime
+
+from plugin import auto_file_path
+from plugin.auto_file_path import CompletionStream, FileNameComplete, merge_completions
+from plugin.fs_cache import DirListing, EntryInfo, scan_dir
+
+
+def make_stream(*triggers: str) -> CompletionStream:
+    return CompletionStream(sublime.CompletionItem(trigger=trigger, completion=trigger) for trigger in triggers)
+
+
+def advance_by(stream: CompletionStream, count: int) -> None:
+    """Builds `count` more items, like a query whose deadline is reached meanwhile."""
+    stream.items.extend(itertools.islice(stream.iterator, count))
+
+
+class TestCompletionStream(unittest.TestCase):
+    def test_resumes(self) -> None:
+        stream = make_stream("a/", "b/", "c.txt")
+        advance_by(stream, 2)
+        self.assertEqual([item.trigger for item in stream.items], ["a/", "b/"])
+
+        self.assertTrue(stream.advance(time.time() + 60))
+        self.assertEqual([item.trigger for item in stream.items], ["a/", "b/", "c.txt"])
+
+    def test_replacements_are_applied_to_built_items(self) -> None:
+        stream = make_stream("lodash/", "react/")
+        self.assertIs(stream.get_items(None), stream.items)
+
+        strip_slash = [["^(\\w+)/$", "\\1"]]
+        advance_by(stream, 1)
+        self.assertEqual([item.completion for item in stream.get_items(strip_slash)], ["lodash"])
+
+        stream.advance(time.time() + 60)
+        self.assertEqual([item.completion for item in stream.get_items(strip_slash)], ["lodash", "react"])
+        # raw items are kept for carets without replacements
+        self.assertEqual([item.completion for item in stream.get_items([])], ["lodash/", "react/"])
+
+    def test_waits_for_listing(self) -> None:
+        listing = DirListing()
+        listing.entries.append(EntryInfo("a", True, False))
+        stream = CompletionStream(FileNameComplete.iter_completions("", listing, "/"))
+        self.assertFalse(stream.advance(time.time() + 60))
+        self.assertEqual([item.trigger for item in stream.items], ["a/"])
+
+        listing.entries.append(EntryInfo("b", True, False))
+        listing.is_complete = True
+        self.assertTrue(stream.advance(time.time() + 60))
+        self.assertEqual([item.trigger for item in stream.items], ["a/", "b/"])
+
+
+class TestStreamRefresh(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = tmp_dir.name
+        self.size_file = Path(self.root, "a.txt")
+        self.size_file.write_text("a", encoding="utf-8")
+        self.listener = FileNameComplete(sublime.View(None, None, "", ""))
+
+    def get_stream(self) -> CompletionStream:
+        identity, mtime_ns, listing = scan_dir(self.root)
+        return self.listener.get_completion_stream(self.root, identity, mtime_ns, listing)
+
+    def test_refreshes_in_background(self) -> None:
+        stream = self.get_stream()
+        self.assertTrue(stream.advance(time.time() + 60))
+        self.assertEqual(stream.items[0].details, "Size: 1 Byte")
+
+        self.size_file.write_text("abc", encoding="utf-8")
+        with mock.patch.object(auto_file_path, "MAXIMUM_STREAM_AGE", -1):
+            # the outdated stream is still served while a new one is built
+            self.assertIs(self.get_stream(), stream)
+            self.assertIs(self.get_stream(), stream)
+            sublime._drain_async()
+
+        refreshed = self.get_stream()
+        self.assertIsNot(refreshed, stream)
+        self.assertTrue(refreshed.is_done)
+        self.assertEqual(refreshed.items[0].details, "Size: 3 Bytes")
+
+
+class TestMergeCompletions(unittest.TestCase):
+    def setUp(self) -> None:
+        auto_file_path.invalidate_merged_completions()
+
+    def triggers(self) -> list[str]:
+        return [item.trigger for item in auto_file_path.g_auto_completions]
+
+    def test_merges_only_new_items(self) -> None:
+        first, second = make_stream("a/", "b/", "c/"), make_stream("b/", "d/")
+        advance_by(first, 1)
+        second.advance(time.time() + 60)
+        merge_completions([first.items, second.items], [])
+        self.assertEqual(self.triggers(), ["a/", "b/", "d/"])
+
+        merged = auto_file_path.g_auto_completions[:]
+        first.advance(time.time() + 60)
+        merge_completions([first.items, second.items], [])
+        self.assertEqual(auto_file_path.g_auto_completions[: len(merged)], merged)
+        self.assertEqual(self.triggers(), ["a/", "b/", "d/", "c/"])
+
+    def test_other_sources_rebuild(self) -> None:
+        first, second = make_stream("a/"), make_stream("b/")
+        first.advance(time.time() + 60)
+        second.advance(time.time() + 60)
+
+        merge_completions([first.items], [])
+        merge_completions([second.items], [])
+        self.assertEqual(self.triggers(), ["b/"])
+
+        anchor = sublime.CompletionItem(trigger="usage")
+        merge_completions([second.items], [anchor])
+        self.assertEqual(self.triggers(), ["usage", "b/"])
+        merge_completions([second.items], [])
+        self.assertEqual(self.triggers(), ["b/"])
+
+    def test_empty_sources_after_extra_items(self) -> None:
+        merge_completions([], [sublime.CompletionItem(trigger="getting-started")])
+        merge_completions([], [])
+        self.assertEqual(self.triggers(), [])
+
+        auto_file_path.g_auto_completions.append(sublime.CompletionItem(trigger="C:/"))
+        auto_file_path.invalidate_merged_completions()
+        merge_completions([], [])
+        self.assertEqual(self.triggers(), [])
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import sublime
+
+from plugin.fs_cache import EntryInfo, cache_set, file_identity, scan_dir, walk_unique
+
+
+class TestCacheSet(unittest.TestCase):
+    def test_evicts_oldest(self) -> None:
+        cache: dict[str, int] = {}
+        for i, key in enumerate("abcd"):
+            cache_set(cache, key, i, 3)
+        self.assertEqual(cache, {"b": 1, "c": 2, "d": 3})
+
+    def test_replaced_key_is_newest(self) -> None:
+        cache = {"a": 0, "b": 1, "c": 2}
+        cache_set(cache, "a", 3, 3)
+        cache_set(cache, "d", 4, 3)
+        self.assertEqual(cache, {"c": 2, "a": 3, "d": 4})
+
+
+class TestScanDir(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = tmp_dir.name
+        os.mkdir(os.path.join(self.root, "sub"))
+        Path(self.root, "a.txt").write_text("a", encoding="utf-8")
+
+    def scan(self, path: str) -> list[EntryInfo]:
+        return sorted(scan_dir(path)[2].entries)
+
+    def test_names_and_types(self) -> None:
+        self.assertEqual(self.scan(self.root), [EntryInfo("a.txt", False, True), EntryInfo("sub", True, False)])
+
+    def test_scans_the_rest_in_async_thread(self) -> None:
+        for i in range(20):
+            Path(self.root, f"{i}.txt").write_text("", encoding="utf-8")
+
+        _, _, listing = scan_dir(self.root, time.time())
+        self.assertFalse(listing.is_complete)
+        self.assertEqual(len(listing.entries), 1)
+        # the listing being scanned is shared
+        self.assertIs(scan_dir(self.root)[2], listing)
+
+        sublime._drain_async()
+        self.assertTrue(listing.is_complete)
+        self.assertEqual(len(listing.entries), 22)
+
+    def backdate(self, seconds: float) -> None:
+        past = time.time() - seconds
+        os.utime(self.root, (past, past))
+
+    def test_cached_listing_is_shared_and_revalidated(self) -> None:
+        self.backdate(60)
+        self.scan(self.root)
+        self.assertEqual(self.scan(os.path.join(self.root, "sub", "..")), self.scan(self.root))
+
+        Path(self.root, "b.txt").write_text("b", encoding="utf-8")
+        self.assertIn(EntryInfo("b.txt", False, True), self.scan(self.root))
+
+    def test_same_mtime_is_trusted_after_mtime_resolution(self) -> None:
+        self.backdate(60)
+        mtime_ns = os.stat(self.root).st_mtime_ns
+        self.scan(self.root)
+
+        # an unchanged mtime means an unchanged directory
+        Path(self.root, "b.txt").write_text("b", encoding="utf-8")
+        os.utime(self.root, ns=(mtime_ns, mtime_ns))
+        self.assertNotIn(EntryInfo("b.txt", False, True), self.scan(self.root))
+
+    def test_same_mtime_is_not_trusted_within_mtime_resolution(self) -> None:
+        # with a coarse timestamp, `b.txt` may have been created in the same tick as the scan
+        self.backdate(1)
+        mtime_ns = os.stat(self.root).st_mtime_ns
+        self.scan(self.root)
+
+        Path(self.root, "b.txt").write_text("b", encoding="utf-8")
+        os.utime(self.root, ns=(mtime_ns, mtime_ns))
+        self.assertIn(EntryInfo("b.txt", False, True), self.scan(self.root))
+
+    def test_identity_without_inode_numbers(self) -> None:
+        st = os.stat(self.root)
+        no_inode = os.stat_result((st.st_mode, 0, *st[2:10]))
+        self.assertNotEqual(
+            file_identity(self.root, no_inode),
+            file_identity(os.path.join(self.root, "sub"), no_inode),
+        )
+        self.assertEqual(
+            file_identity(self.root, no_inode),
+            file_identity(os.path.join(self.root, "sub", ".."), no_inode),
+        )
+
+
+class TestWalkUnique(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = os.path.realpath(tmp_dir.name)
+        for path in ("project/docs", "project/lib/docs", "outside/docs"):
+            os.makedirs(os.path.join(self.root, path))
+        os.symlink(os.path.join(self.root, "project", "lib"), os.path.join(self.root, "project", "docs", "lib"))
+        os.symlink(os.path.join(self.root, "project"), os.path.join(self.root, "project", "lib", "loop"))
+        os.symlink(os.path.join(self.root, "outside"), os.path.join(self.root, "project", "outside"))
+
+    def test_follows_only_links_within_folder(self) -> None:
+        folder = os.path.join(self.root, "project")
+        walked = {os.path.relpath(root, folder) for root, _, _ in walk_unique(folder)}
+        self.assertNotIn("outside", walked)
+        # `lib` is reached either directly or via `docs/lib`, but only once
+        self.assertEqual(len([path for path in walked if path.endswith("lib")]), 1)
+        self.assertEqual(len(walked), 4)
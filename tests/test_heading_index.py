@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import sublime
+
+from plugin import heading_index
+from plugin.heading_index import parse_headings, slugify, warm_folder_async
+
+
+class TestSlugify(unittest.TestCase):
+    def test_github_style(self) -> None:
+        self.assertEqual(slugify("Hello World"), "hello-world")
+        self.assertEqual(slugify("  What's new in `v2.0`?  "), "whats-new-in-v20")
+        self.assertEqual(slugify("snake_case and kebab-case"), "snake_case-and-kebab-case")
+
+    def test_inline_link_keeps_text(self) -> None:
+        self.assertEqual(slugify("[Link](x.md) and *stuff*!"), "link-and-stuff")
+
+
+class TestParseHeadings(unittest.TestCase):
+    def parse(self, content: str) -> tuple[tuple[str, str], ...]:
+        fd, path = tempfile.mkstemp(suffix=".md")
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        return parse_headings(path)
+
+    def test_atx(self) -> None:
+        self.assertEqual(
+            self.parse("# Title\n## Closed ##\n#not-a-heading\n    # indented code\n"),
+            (("title", "Title"), ("closed", "Closed")),
+        )
+
+    def test_setext(self) -> None:
+        self.assertEqual(
+            self.parse("Title\n=====\n\nSection\n-------\n\n---\n"),
+            (("title", "Title"), ("section", "Section")),
+        )
+
+    def test_duplicated_slugs(self) -> None:
+        self.assertEqual(
+            [slug for slug, _ in self.parse("# Usage\n## Usage\n### Usage\n")],
+            ["usage", "usage-1", "usage-2"],
+        )
+
+    def test_front_matter(self) -> None:
+        self.assertEqual(
+            self.parse("---\ntitle: x\nlayout: doc\n---\n# Real\n"),
+            (("real", "Real"),),
+        )
+
+    def test_thematic_break_not_front_matter(self) -> None:
+        self.assertEqual(self.parse("# A\n---\ntext\n---\n"), (("a", "A"), ("text", "text")))
+
+    def test_fences(self) -> None:
+        content = "```\n# not heading\n```python\n# still not heading\n```\n# Heading\n~~~~\n# no\n~~~\n# no\n~~~~\n"
+        self.assertEqual(self.parse(content), (("heading", "Heading"),))
+
+
+class TestWarmFolder(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = os.path.realpath(tmp_dir.name)
+        for i in range(5):
+            Path(self.root, f"doc{i}.md").write_text(f"# Doc {i}\n", encoding="utf-8")
+
+    def test_async_in_batches(self) -> None:
+        with mock.patch.object(heading_index, "WARM_UP_BATCH_TIME", 0):
+            warm_folder_async(self.root)
+            # each batch does at least one step and then yields the async thread
+            self.assertGreater(sublime._drain_async(), 5)
+
+        for i in range(5):
+            self.assertIn(os.path.join(self.root, f"doc{i}.md"), heading_index.g_heading_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
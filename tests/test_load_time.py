@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import unittest
+
+from tools.load_time import measure
+
+
+class TestLoadTime(unittest.TestCase):
+    def test_loads_through_boot(self) -> None:
+        # fails if `boot.py` does not export the plugin hooks
+        timings, modules = measure()
+        self.assertGreater(timings["plugin_loaded_ms"], 0)
+        self.assertIn("AutoFilePath.plugin.auto_file_path", [name for name, *_ in modules])
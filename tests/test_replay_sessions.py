@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import glob
+import json
+import os
+import unittest
+from pathlib import Path
+from typing import Any
+
+from tools.replay.__main__ import SESSIONS_DIR
+from tools.replay.harness import run_session
+
+
+def load_session(name: str) -> dict[str, Any]:
+    session = json.loads(Path(SESSIONS_DIR, f"{name}.json").read_text(encoding="utf-8"))
+    session["name"] = name
+    return session
+
+
+class TestReplaySessions(unittest.TestCase):
+    def test_bundled_sessions(self) -> None:
+        for session_file in sorted(glob.glob(os.path.join(SESSIONS_DIR, "*.json"))):
+            name = os.path.splitext(os.path.basename(session_file))[0]
+            with self.subTest(name):
+                self.assertEqual(run_session(load_session(name)).violations, [])
+
+    def test_multi_caret_lists_each_directory_once(self) -> None:
+        # 4 carets reach 2 directories per path level, spelled in 3 ways for `site/`
+        report = run_session(load_session("multi-caret-img"))
+        self.assertEqual(report.violations, [])
+        self.assertEqual(report.syscall_breakdown["os.scandir"], 4)
+
+        report = run_session(load_session("multi-caret-img"), {"os.scandir": 3})
+        self.assertEqual(report.violations, ["os.scandir = 4 exceeds the budget 3"])
@@ -0,0 +1,120 @@
+"""
+Reports how long loading the plugin takes, per imported module.
+
+Usage: python -m tools.load_time [--repeat N] [--top N] [--max-ms MS]
+
+The package is loaded in a fresh interpreter with `-X importtime` against the stand-in `sublime` API from
+`tools.replay` the same way as Sublime Text does on startup: `boot.py` is imported as a module of the package,
+then `plugin_loaded()` is called if `boot.py` exports it.
+Only modules imported because of the plugin are listed. Exits with 1 if the median total exceeds `--max-ms`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from .replay.harness import FAKE_SUBLIME_DIR, REPO_DIR
+
+# the name of the package directory in `Packages/`
+PACKAGE_NAME = "AutoFilePath"
+MARKER = "--- plugin import starts ---"
+IMPORT_TIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+LOADER = """
+import importlib, json, sys, time
+sys.path[:0] = [{fake_sublime_dir!r}, {packages_dir!r}]
+import sublime, sublime_plugin
+sublime._reset(settings_dirs=[{repo_dir!r}])
+sublime._set_active_window(sublime.Window([]))
+print({marker!r}, file=sys.stderr, flush=True)
+start = time.perf_counter()
+boot = importlib.import_module({package!r} + ".boot")
+imported = time.perf_counter()
+hooks = [name for name in ("plugin_loaded", "plugin_unloaded") if not callable(getattr(boot, name, None))]
+if hooks:
+    sys.exit("not exported by boot.py so never called by Sublime Text: " + ", ".join(hooks))
+boot.plugin_loaded()
+loaded = time.perf_counter()
+print(json.dumps({{"import_ms": (imported - start) * 1000, "plugin_loaded_ms": (loaded - imported) * 1000}}))
+"""
+
+
+def measure() -> tuple[dict[str, float], list[tuple[str, int, int, int]]]:
+    """Returns `(timings, [(module, self us, cumulative us, nesting level), ...])` of one cold load."""
+    with tempfile.TemporaryDirectory() as packages_dir:
+        # like `Packages/AutoFilePath/`
+        os.symlink(REPO_DIR, os.path.join(packages_dir, PACKAGE_NAME))
+        loader = LOADER.format(
+            fake_sublime_dir=FAKE_SUBLIME_DIR,
+            packages_dir=packages_dir,
+            repo_dir=REPO_DIR,
+            marker=MARKER,
+            package=PACKAGE_NAME,
+        )
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", loader], capture_output=True, text=True)
+
+    if proc.returncode:
+        raise SystemExit(proc.stderr.strip().splitlines()[-1])
+
+    modules: list[tuple[str, int, int, int]] = []
+    stderr = proc.stderr.split(MARKER, 1)[-1]
+    for line in stderr.splitlines():
+        if m := IMPORT_TIME_RE.match(line):
+            modules.append((m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+
+    return json.loads(proc.stdout.strip().splitlines()[-1]), modules
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m tools.load_time", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="measure N cold loads and report medians")
+    parser.add_argument("--top", type=int, default=20, help="list the N slowest modules")
+    parser.add_argument("--max-ms", type=float, help="budget of the median total load time")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    runs = [measure() for _ in range(max(args.repeat, 1))]
+    import_ms = statistics.median(timings["import_ms"] for timings, _ in runs)
+    loaded_ms = statistics.median(timings["plugin_loaded_ms"] for timings, _ in runs)
+    total_ms = import_ms + loaded_ms
+
+    per_module: dict[str, list[tuple[int, int, int]]] = {}
+    for _, modules in runs:
+        for name, self_us, cumulative_us, level in modules:
+            per_module.setdefault(name, []).append((self_us, cumulative_us, level))
+
+    print(f"import: {import_ms:.2f} ms, plugin_loaded(): {loaded_ms:.2f} ms, total: {total_ms:.2f} ms")
+    print(f"{'self (us)':>10} {'cumul (us)':>11}  module")
+    rows = sorted(
+        (
+            (
+                statistics.median(s for s, _, _ in samples),
+                statistics.median(c for _, c, _ in samples),
+                samples[0][2],
+                name,
+            )
+            for name, samples in per_module.items()
+        ),
+        reverse=True,
+    )
+    for self_us, cumulative_us, level, name in rows[: args.top]:
+        print(f"{self_us:>10.0f} {cumulative_us:>11.0f}  {'  ' * level}{name}")
+
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"BUDGET EXCEEDED: total load time {total_ms:.2f} ms exceeds {args.max_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
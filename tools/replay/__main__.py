@@ -0,0 +1,72 @@
+"""
+Replays recorded typing sessions against the plugin and reports end-to-end completion latency.
+
+Usage: python -m tools.replay [SESSION.json ...] [--repeat N] [--json] [--p95-ms MS] ...
+
+Without session files, all sessions under `tools/replay/sessions/` are replayed.
+Exits with 1 if any session exceeds its budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import sys
+
+from .harness import SessionReport, run_session
+
+SESSIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sessions")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m tools.replay", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("sessions", nargs="*", help="session files (default: all bundled sessions)")
+    parser.add_argument("--repeat", type=int, default=1, help="replay each session N times")
+    parser.add_argument("--json", action="store_true", help="print reports as JSON")
+    for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms", "syscalls", "syscalls_per_keystroke", "rebuilds"):
+        parser.add_argument(f"--{key.replace('_', '-')}", type=float, dest=key, help=f"budget of {key}")
+    return parser.parse_args()
+
+
+def format_report(report: SessionReport) -> str:
+    s = report.summary()
+    lines = [
+        f"{s['name']}: {s['keystrokes']} keystrokes",
+        f"  latency (ms): p50={s['p50_ms']} p90={s['p90_ms']} p95={s['p95_ms']} p99={s['p99_ms']} max={s['max_ms']}",
+        f"  syscalls: {s['syscalls']} (max {s['max_syscalls_per_keystroke']} per keystroke, excluding async work)",
+        "    " + ", ".join(f"{name}={count}" for name, count in s["syscall_breakdown"].items()),
+        f"  completion rebuilds (streams built from scratch): {s['rebuilds']}",
+        f"  async work (ms): {s['async_ms']}",
+    ]
+    lines.extend(f"  BUDGET EXCEEDED: {violation}" for violation in s["violations"])
+    return "\n".join(lines)
+
+
+def main() -> int:
+    args = parse_args()
+    budget = {
+        key: value
+        for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms", "syscalls", "syscalls_per_keystroke", "rebuilds")
+        if (value := getattr(args, key)) is not None
+    }
+
+    reports: list[SessionReport] = []
+    for session_file in args.sessions or sorted(glob.glob(os.path.join(SESSIONS_DIR, "*.json"))):
+        with open(session_file, encoding="utf-8") as f:
+            session = json.load(f)
+        session.setdefault("name", os.path.splitext(os.path.basename(session_file))[0])
+        for _ in range(args.repeat):
+            reports.append(run_session(session, budget))
+
+    if args.json:
+        print(json.dumps([report.summary() for report in reports], indent=2))
+    else:
+        print("\n".join(map(format_report, reports)))
+
+    return 1 if any(report.violations for report in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
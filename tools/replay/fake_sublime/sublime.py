@@ -0,0 +1,405 @@
+"""
+A minimal in-process stand-in of the `sublime` module.
+
+Only the parts used by this plugin are implemented. Views are plain text buffers whose scopes come from
+the replayed session rather than from a real syntax definition.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+INHIBIT_WORD_COMPLETIONS = 8
+INHIBIT_EXPLICIT_COMPLETIONS = 16
+DYNAMIC_COMPLETIONS = 32
+INHIBIT_REORDER = 128
+
+KIND_ID_AMBIGUOUS = 0
+KIND_ID_KEYWORD = 1
+KIND_ID_TYPE = 2
+KIND_ID_FUNCTION = 3
+KIND_ID_NAMESPACE = 4
+KIND_ID_NAVIGATION = 5
+KIND_ID_MARKUP = 6
+KIND_ID_VARIABLE = 7
+KIND_ID_SNIPPET = 8
+
+WORD_SEPARATORS = "./\\()\"'-:,.;<>~!@#$%^&*|+=[]{}`~?"
+
+_platform = "linux"
+_settings: dict[str, Settings] = {}
+_settings_dirs: list[str] = []
+_async_queue: deque[Callable[[], Any]] = deque()
+_active_window: Window | None = None
+
+
+# ---------- #
+# test hooks #
+# ---------- #
+
+
+def _reset(platform_name: str = "linux", settings_dirs: Iterable[str] = ()) -> None:
+    global _platform, _active_window
+
+    _platform = platform_name
+    _settings.clear()
+    _settings_dirs[:] = settings_dirs
+    _async_queue.clear()
+    _active_window = None
+
+
+def _set_active_window(window: Window) -> None:
+    global _active_window
+
+    _active_window = window
+
+
+def _drain_async() -> int:
+    """Runs all scheduled callbacks, including those scheduled meanwhile. Returns how many were run."""
+    count = 0
+    while _async_queue:
+        _async_queue.popleft()()
+        count += 1
+    return count
+
+
+def _loads_json(content: str) -> Any:
+    """Parses JSON with comments and trailing commas, like `*.sublime-settings` files."""
+    content = re.sub(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', lambda m: m.group(1) or "", content, flags=re.DOTALL)
+    content = re.sub(r'("(?:\\.|[^"\\])*")|,(\s*[\]}])', lambda m: m.group(1) or m.group(2), content)
+    return json.loads(content)
+
+
+# --- #
+# API #
+# --- #
+
+
+def platform() -> str:
+    return _platform
+
+
+def active_window() -> Window:
+    assert _active_window, "no active window"
+    return _active_window
+
+
+def set_timeout(f: Callable[[], Any], timeout_ms: float = 0) -> None:
+    _async_queue.append(f)
+
+
+def set_timeout_async(f: Callable[[], Any], timeout_ms: float = 0) -> None:
+    _async_queue.append(f)
+
+
+def load_settings(base_name: str) -> Settings:
+    if base_name not in _settings:
+        data: dict[str, Any] = {}
+        for settings_dir in _settings_dirs:
+            path = os.path.join(settings_dir, base_name)
+            if os.path.isfile(path):
+                data.update(_loads_json(Path(path).read_text(encoding="utf-8")))
+        _settings[base_name] = Settings(data)
+    return _settings[base_name]
+
+
+class Settings:
+    def __init__(self, data: dict[str, Any] | None = None) -> None:
+        self._data = dict(data or {})
+        self._listeners: dict[str, Callable[[], Any]] = {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        self._data[key] = value
+        for listener in tuple(self._listeners.values()):
+            listener()
+
+    def has(self, key: str) -> bool:
+        return key in self._data
+
+    def add_on_change(self, tag: str, callback: Callable[[], Any]) -> None:
+        self._listeners[tag] = callback
+
+    def clear_on_change(self, tag: str) -> None:
+        self._listeners.pop(tag, None)
+
+
+class Region:
+    def __init__(self, a: int, b: int | None = None) -> None:
+        self.a = a
+        self.b = a if b is None else b
+
+    def __iter__(self) -> Iterator[int]:
+        return iter((self.a, self.b))
+
+    def __len__(self) -> int:
+        return self.size()
+
+    def __eq__(self, rhs: Any) -> bool:
+        return isinstance(rhs, Region) and (self.a, self.b) == (rhs.a, rhs.b)
+
+    def __lt__(self, rhs: Region) -> bool:
+        return (self.begin(), self.end()) < (rhs.begin(), rhs.end())
+
+    def __repr__(self) -> str:
+        return f"Region({self.a}, {self.b})"
+
+    def begin(self) -> int:
+        return min(self.a, self.b)
+
+    def end(self) -> int:
+        return max(self.a, self.b)
+
+    def size(self) -> int:
+        return self.end() - self.begin()
+
+    def empty(self) -> bool:
+        return self.a == self.b
+
+
+class Selection:
+    def __init__(self) -> None:
+        self._regions: list[Region] = []
+
+    def __iter__(self) -> Iterator[Region]:
+        return iter(tuple(self._regions))
+
+    def __len__(self) -> int:
+        return len(self._regions)
+
+    def __getitem__(self, index: int) -> Region:
+        return self._regions[index]
+
+    def __bool__(self) -> bool:
+        return bool(self._regions)
+
+    def clear(self) -> None:
+        self._regions.clear()
+
+    def add(self, region: Region | int) -> None:
+        if isinstance(region, int):
+            region = Region(region)
+        # a newly added region replaces the ones it overlaps with
+        self._regions = [
+            r
+            for r in self._regions
+            if r.end() < region.begin() or r.begin() > region.end() or (r.empty() and region.empty() and r != region)
+        ]
+        self._regions.append(region)
+        self._regions.sort()
+
+    def add_all(self, regions: Iterable[Region | int]) -> None:
+        for region in regions:
+            self.add(region)
+
+
+class CompletionItem:
+    def __init__(
+        self,
+        trigger: str,
+        annotation: str = "",
+        completion: str = "",
+        completion_format: int = 0,
+        kind: tuple[int, str, str] = (KIND_ID_AMBIGUOUS, "", ""),
+        details: str = "",
+    ) -> None:
+        self.trigger = trigger
+        self.annotation = annotation
+        self.completion = completion or trigger
+        self.completion_format = completion_format
+        self.kind = kind
+        self.details = details
+
+
+class CompletionList:
+    def __init__(self, completions: list[CompletionItem] | None = None, flags: int = 0) -> None:
+        self.completions = completions
+        self.flags = flags
+
+    def set_completions(self, completions: list[CompletionItem], flags: int = 0) -> None:
+        self.completions = completions
+        self.flags = flags
+
+
+class Edit:
+    pass
+
+
+class Window:
+    def __init__(self, folders: list[str]) -> None:
+        self._folders = folders
+        self._views: list[View] = []
+
+    def folders(self) -> list[str]:
+        return list(self._folders)
+
+    def views(self) -> list[View]:
+        return list(self._views)
+
+    def active_view(self) -> View | None:
+        return self._views[-1] if self._views else None
+
+
+class View:
+    """
+    A text buffer. `scope` is applied to every point unless the replayer provides a per-point `scope_resolver`
+    and `extract_scope()` falls back to the quoted string (or bracketed group, or tag) around the point.
+    """
+
+    def __init__(self, window: Window | None, file_name: str | None, text: str, scope: str) -> None:
+        self._window = window
+        self._file_name = file_name
+        self._text = text
+        self._sel = Selection()
+        self._settings = Settings()
+        self.base_scope = scope
+        self.scope_resolver: Callable[[int], str] | None = None
+        self.command_handler: Callable[[View, str, dict[str, Any]], Any] | None = None
+        if window:
+            window._views.append(self)
+
+    # ----- #
+    # state #
+    # ----- #
+
+    def window(self) -> Window | None:
+        return self._window
+
+    def file_name(self) -> str | None:
+        return self._file_name
+
+    def settings(self) -> Settings:
+        return self._settings
+
+    def sel(self) -> Selection:
+        return self._sel
+
+    def size(self) -> int:
+        return len(self._text)
+
+    def run_command(self, cmd: str, args: dict[str, Any] | None = None) -> None:
+        if self.command_handler:
+            self.command_handler(self, cmd, args or {})
+
+    # ---- #
+    # text #
+    # ---- #
+
+    def substr(self, x: Region | int) -> str:
+        if isinstance(x, int):
+            return self._text[x] if 0 <= x < len(self._text) else "\x00"
+        return self._text[max(0, x.begin()) : max(0, x.end())]
+
+    def line(self, x: Region | int) -> Region:
+        pt = x if isinstance(x, int) else x.begin()
+        pt = min(max(pt, 0), len(self._text))
+        a = self._text.rfind("\n", 0, pt) + 1
+        b = self._text.find("\n", pt)
+        return Region(a, len(self._text) if b < 0 else b)
+
+    def word(self, x: Region | int) -> Region:
+        pt = x if isinstance(x, int) else x.begin()
+        line = self.line(pt)
+
+        def is_word_char(c: str) -> bool:
+            return not (c.isspace() or c in WORD_SEPARATORS)
+
+        def is_punctuation(c: str) -> bool:
+            return not (c.isspace() or is_word_char(c))
+
+        # like Sublime Text, a point not touching any word gives the run of punctuation around it
+        expands = is_word_char
+        if not any(line.a <= p < line.b and is_word_char(self._text[p]) for p in (pt - 1, pt)):
+            expands = is_punctuation
+
+        a = b = pt
+        while a > line.a and expands(self._text[a - 1]):
+            a -= 1
+        while b < line.b and expands(self._text[b]):
+            b += 1
+        return Region(a, b)
+
+    def find(self, pattern: str, start_pt: int, flags: int = 0) -> Region:
+        m = re.compile(pattern).search(self._text, start_pt)
+        return Region(m.start(), m.end()) if m else Region(-1)
+
+    def insert(self, edit: Edit, pt: int, text: str) -> int:
+        self._splice(pt, pt, text)
+        return len(text)
+
+    def erase(self, edit: Edit, region: Region) -> None:
+        self._splice(region.begin(), region.end(), "")
+
+    def replace(self, edit: Edit, region: Region, text: str) -> None:
+        if region.a < 0:
+            return
+        self._splice(region.begin(), region.end(), text)
+
+    def _splice(self, begin: int, end: int, text: str) -> None:
+        self._text = self._text[:begin] + text + self._text[end:]
+        delta = len(text) - (end - begin)
+
+        def shift(pt: int) -> int:
+            if pt >= end:
+                return pt + delta
+            # points within the replaced text end up after the new text
+            return begin + len(text) if pt >= begin else pt
+
+        regions = [Region(shift(r.a), shift(r.b)) for r in self._sel]
+        self._sel.clear()
+        self._sel.add_all(regions)
+
+    # ------ #
+    # scopes #
+    # ------ #
+
+    def scope_name(self, pt: int) -> str:
+        return (self.scope_resolver(pt) if self.scope_resolver else self.base_scope) + " "
+
+    def match_selector(self, pt: int, selector: str) -> bool:
+        return score_selector(self.scope_name(pt), selector) > 0
+
+    def extract_scope(self, pt: int) -> Region:
+        line = self.line(pt)
+        text = self._text
+        pairs = {'"': '"', "'": "'", "`": "`", "(": ")", "<": ">"}
+
+        # the innermost quoted string, parenthesized group or tag around the point on its line
+        for a in range(min(pt, line.b) - 1, line.a - 1, -1):
+            if (closing := pairs.get(text[a])) is None:
+                continue
+            b = text.find(closing, max(a + 1, pt), line.b)
+            if b >= 0:
+                return Region(a, b + 1)
+        return self.word(pt)
+
+
+def score_selector(scope_name: str, selector: str) -> int:
+    """A simplified selector matcher supporting `,` / `|` alternatives, ` - ` exclusions and descendants."""
+    scopes = scope_name.split()
+
+    def match_path(path: str) -> bool:
+        idx = 0
+        for part in path.split():
+            while idx < len(scopes) and not (scopes[idx] == part or scopes[idx].startswith(part + ".")):
+                idx += 1
+            if idx == len(scopes):
+                return False
+            idx += 1
+        return True
+
+    for alternative in re.split(r"[,|]", selector):
+        included, *excluded = alternative.split(" - ")
+        if not included.strip() or not match_path(included):
+            continue
+        if any(match_path(path) for path in excluded if path.strip()):
+            continue
+        return 1
+    return 0
@@ -0,0 +1,32 @@
+"""A minimal in-process stand-in of the `sublime_plugin` module."""
+
+from __future__ import annotations
+
+import sublime
+
+
+class Command:
+    pass
+
+
+class TextCommand(Command):
+    def __init__(self, view: sublime.View) -> None:
+        self.view = view
+
+
+class WindowCommand(Command):
+    def __init__(self, window: sublime.Window) -> None:
+        self.window = window
+
+
+class ApplicationCommand(Command):
+    pass
+
+
+class EventListener:
+    pass
+
+
+class ViewEventListener:
+    def __init__(self, view: sublime.View) -> None:
+        self.view = view
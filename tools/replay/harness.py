@@ -0,0 +1,398 @@
+from __future__ import annotations
+
+import base64
+import importlib
+import os
+import pkgutil
+import re
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Generator, Iterator
+
+from .syscalls import SyscallCounter
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FAKE_SUBLIME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_sublime")
+PLUGIN_PACKAGE = "plugin"
+
+# characters which make Sublime Text query completions while typing, like `auto_complete_triggers`
+DEFAULT_TRIGGER_CHARS = "/"
+
+
+def load_plugin() -> tuple[Any, Any, Any]:
+    """Imports the plugin against the fake `sublime` API. Returns `(sublime, sublime_plugin, plugin module)`."""
+    for path in (FAKE_SUBLIME_DIR, REPO_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    sublime = importlib.import_module("sublime")
+    sublime_plugin = importlib.import_module("sublime_plugin")
+    plugin = importlib.import_module(PLUGIN_PACKAGE)
+    # import lazily loaded submodules upfront so that importing is not measured as keystroke latency
+    for module_info in pkgutil.walk_packages(plugin.__path__, f"{PLUGIN_PACKAGE}."):
+        importlib.import_module(module_info.name)
+
+    return sublime, sublime_plugin, plugin
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lo = int(rank)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (rank - lo)
+
+
+@dataclass
+class KeystrokeStat:
+    event: str
+    latency_ms: float
+    syscalls: int
+    rebuilds: int
+    # time spent in callbacks scheduled by `set_timeout_async()`, which does not block typing
+    async_ms: float = 0.0
+
+
+@dataclass
+class SessionReport:
+    name: str
+    keystrokes: list[KeystrokeStat] = field(default_factory=list)
+    syscall_breakdown: dict[str, int] = field(default_factory=dict)
+    violations: list[str] = field(default_factory=list)
+
+    @property
+    def latencies(self) -> list[float]:
+        return [k.latency_ms for k in self.keystrokes]
+
+    @property
+    def syscalls(self) -> int:
+        return sum(k.syscalls for k in self.keystrokes)
+
+    @property
+    def async_ms(self) -> float:
+        return sum(k.async_ms for k in self.keystrokes)
+
+    @property
+    def rebuilds(self) -> int:
+        return sum(k.rebuilds for k in self.keystrokes)
+
+    def summary(self) -> dict[str, Any]:
+        latencies = self.latencies
+        return {
+            "name": self.name,
+            "keystrokes": len(self.keystrokes),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p90_ms": round(percentile(latencies, 90), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "max_ms": round(max(latencies, default=0.0), 3),
+            "syscalls": self.syscalls,
+            "max_syscalls_per_keystroke": max((k.syscalls for k in self.keystrokes), default=0),
+            "rebuilds": self.rebuilds,
+            "async_ms": round(self.async_ms, 3),
+            "syscall_breakdown": dict(sorted(self.syscall_breakdown.items())),
+            "violations": self.violations,
+        }
+
+    def check_budget(self, budget: dict[str, float]) -> None:
+        summary = self.summary()
+        limits = (
+            ("p50_ms", "p50_ms"),
+            ("p95_ms", "p95_ms"),
+            ("p99_ms", "p99_ms"),
+            ("max_ms", "max_ms"),
+            ("syscalls", "syscalls"),
+            ("syscalls_per_keystroke", "max_syscalls_per_keystroke"),
+            ("rebuilds", "rebuilds"),
+        )
+        for budget_key, summary_key in limits:
+            if (limit := budget.get(budget_key)) is not None and summary[summary_key] > limit:
+                self.violations.append(f"{summary_key} = {summary[summary_key]} exceeds the budget {limit}")
+
+        # the other keys are budgets of single functions, like `"os.scandir": 2`
+        for name, limit in budget.items():
+            if name not in dict(limits) and (count := self.syscall_breakdown.get(name, 0)) > limit:
+                self.violations.append(f"{name} = {count} exceeds the budget {limit}")
+
+
+def build_tree(root: str, session: dict[str, Any]) -> None:
+    """Creates the fixture tree. A path with a trailing `/` is a directory, `{"base64": ...}` is binary content."""
+    entries: dict[str, str | dict[str, str]] = dict(session.get("tree", {}))
+    for bulk in session.get("bulk", []):
+        for i in range(bulk["count"]):
+            entries[os.path.join(bulk["dir"], bulk["name"].format(i))] = bulk.get("content", "")
+
+    for rel_path, content in entries.items():
+        path = os.path.join(root, rel_path)
+        if rel_path.endswith("/"):
+            os.makedirs(path, exist_ok=True)
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if isinstance(content, dict):
+            Path(path).write_bytes(base64.b64decode(content["base64"]))
+        else:
+            Path(path).write_text(content, encoding="utf-8")
+
+    for link, target in session.get("symlinks", {}).items():
+        path = os.path.join(root, link)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.symlink(target, path)
+
+    # like a project created a while ago, whose directory listings can be cached
+    past = time.time() - 60
+    for dir_path, _, _ in os.walk(root):
+        os.utime(dir_path, (past, past))
+
+
+def iter_keystrokes(events: list[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    """Splits typed text into one event per character, the way it is typed."""
+    for event in events:
+        if "insert" in event and len(event["insert"]) > 1:
+            for char in event["insert"]:
+                yield {**event, "insert": char}
+        else:
+            yield event
+
+
+class Replayer:
+    """Replays a recorded typing session against the plugin, simulating how Sublime Text dispatches events."""
+
+    def __init__(self, session: dict[str, Any], root: str) -> None:
+        self.sublime, self.sublime_plugin, self.plugin = load_plugin()
+        self.session = session
+        self.root = root
+
+        self.sublime._reset(session.get("platform", "linux"), settings_dirs=(REPO_DIR,))
+        settings = self.sublime.load_settings("AutoFilePath.sublime-settings")
+        for key, value in session.get("settings", {}).items():
+            settings.set(key, value)
+
+        self.window = self.sublime.Window([root])
+        self.sublime._set_active_window(self.window)
+        file_name = os.path.join(root, session["file"]) if session.get("file") else None
+        self.view = self.sublime.View(self.window, file_name, session.get("text", ""), session.get("scope", ""))
+        self.view.command_handler = self.on_command
+        self.view.scope_resolver = self.resolve_scope
+        for key, value in session.get("view_settings", {}).items():
+            self.view.settings().set(key, value)
+        self.view.sel().add_all(self.to_regions(session.get("caret", [len(session.get("text", ""))])))
+
+        self.text_commands = self.collect_text_commands()
+        self.listener = self.plugin.auto_file_path.FileNameComplete(self.view)
+        self.trigger_chars = session.get("trigger_chars", DEFAULT_TRIGGER_CHARS)
+        self.event: dict[str, Any] = {}
+        self.auto_complete_visible = False
+        self.auto_complete_requested = False
+        self.completions: list[Any] = []
+        self.rebuilds = 0
+
+    # --------- #
+    # utilities #
+    # --------- #
+
+    def collect_text_commands(self) -> dict[str, type]:
+        commands: dict[str, type] = {}
+        for obj in vars(self.plugin.auto_file_path).values():
+            if isinstance(obj, type) and issubclass(obj, self.sublime_plugin.TextCommand):
+                name = re.sub(r"Command$", "", obj.__name__)
+                commands[re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()] = obj
+        return commands
+
+    @contextmanager
+    def counting_rebuilds(self) -> Generator[None, None, None]:
+        """Counts completion streams built from scratch, as opposed to queries resuming or reusing one."""
+        stream_class = self.plugin.auto_file_path.CompletionStream
+        init = stream_class.__init__
+
+        def wrapper(stream: Any, *args: Any, **kwargs: Any) -> None:
+            self.rebuilds += 1
+            init(stream, *args, **kwargs)
+
+        stream_class.__init__ = wrapper
+        try:
+            yield
+        finally:
+            stream_class.__init__ = init
+
+    def to_regions(self, values: list[Any]) -> list[Any]:
+        return [self.sublime.Region(*v) if isinstance(v, list) else self.sublime.Region(v) for v in values]
+
+    def resolve_scope(self, pt: int) -> str:
+        if scope := self.event.get("scope"):
+            return scope
+
+        view = self.view
+        scope = view.base_scope
+        if string_scope := self.session.get("string_scope"):
+            region = view.extract_scope(pt)
+            if view.substr(region.a) in "\"'`" and region.a <= pt < region.b:
+                scope += f" {string_scope}"
+                if pt == region.b - 1:
+                    scope += " punctuation.definition.string.end"
+        return scope
+
+    def prefix(self) -> str:
+        view = self.view
+        caret = view.sel()[0].b
+        return view.substr(self.sublime.Region(view.word(caret).a, caret))
+
+    # --------------------------- #
+    # Sublime Text's side effects #
+    # --------------------------- #
+
+    def on_command(self, view: Any, cmd: str, args: dict[str, Any]) -> None:
+        if cmd == "auto_complete":
+            self.auto_complete_requested = True
+        elif cmd == "hide_auto_complete":
+            self.auto_complete_visible = False
+        elif cmd == "left_delete":
+            self.left_delete()
+        elif cmd == "commit_completion":
+            self.commit_completion()
+        elif command := self.text_commands.get(cmd):
+            command(view).run(self.sublime.Edit(), **args)
+
+    def insert(self, text: str) -> None:
+        view = self.view
+        for region in reversed(tuple(view.sel())):
+            view.replace(self.sublime.Edit(), region, text)
+
+    def left_delete(self) -> None:
+        view = self.view
+        for region in reversed(tuple(view.sel())):
+            if region.empty():
+                region = self.sublime.Region(region.a - 1, region.a)
+            view.erase(self.sublime.Edit(), region)
+
+    def commit_completion(self) -> None:
+        text = self.event.get("commit")
+        if not (self.auto_complete_visible and text):
+            return
+
+        view = self.view
+        self.auto_complete_visible = False
+        for region in reversed(tuple(view.sel())):
+            view.replace(self.sublime.Edit(), self.sublime.Region(view.word(region.b).a, region.b), text)
+
+    def query_completions(self) -> None:
+        self.auto_complete_requested = False
+        locations = [region.b for region in self.view.sel()]
+        result = self.listener.on_query_completions(self.prefix(), locations)
+
+        if result is None:
+            self.completions = []
+        elif isinstance(result, tuple):
+            self.completions = list(result[0])
+        else:
+            self.completions = list(result.completions or [])
+        self.auto_complete_visible = bool(self.completions)
+
+    def query_context(self, key: str, operand: Any, match_all: bool = False) -> bool:
+        if key.startswith("setting."):
+            return self.view.settings().get(key[8:], self.plugin_setting(key[8:])) == operand
+        if key == "auto_complete_visible":
+            return self.auto_complete_visible == operand
+        return self.listener.on_query_context(key, "equal", operand, match_all)
+
+    def plugin_setting(self, key: str) -> Any:
+        return self.sublime.load_settings("AutoFilePath.sublime-settings").get(key)
+
+    # -------- #
+    # replayer #
+    # -------- #
+
+    def press(self, event: dict[str, Any]) -> None:
+        """Performs a single keystroke, including the event handlers and queries it triggers."""
+        self.event = event
+        modified = selection_modified = True
+        query = False
+
+        if "insert" in event:
+            char = event["insert"]
+            self.insert(char)
+            query = self.auto_complete_visible or char.isalnum() or char in "_-" or char in self.trigger_chars
+        elif "select" in event:
+            self.view.sel().clear()
+            self.view.sel().add_all(self.to_regions(event["select"]))
+            self.auto_complete_visible = modified = False
+        elif event.get("key") == "backspace":
+            if self.query_context("afp_deleting_slash", True, match_all=True):
+                self.on_command(self.view, "reload_auto_complete", {})
+            else:
+                self.left_delete()
+                query = self.auto_complete_visible
+        elif event.get("key") in ("tab", "enter") or "commit" in event:
+            if self.auto_complete_visible and self.query_context("setting.afp_insert_dimensions", True):
+                self.on_command(self.view, "insert_dimensions", {})
+            else:
+                self.commit_completion()
+        elif command := event.get("command"):
+            self.on_command(self.view, command, event.get("args", {}))
+            modified = False
+        else:
+            raise ValueError(f"Unknown event: {event}")
+
+        if modified:
+            self.listener.on_modified_async()
+        if selection_modified:
+            self.listener.on_selection_modified_async()
+        if query or self.auto_complete_requested:
+            self.query_completions()
+
+    def replay(self, counter: SyscallCounter) -> SessionReport:
+        report = SessionReport(self.session.get("name", self.session.get("file", "session")))
+
+        self.listener.on_activated()
+        self.listener.on_activated_async()
+        self.sublime._drain_async()
+
+        counter.install()
+        try:
+            with self.counting_rebuilds():
+                for event in iter_keystrokes(self.session["events"]):
+                    counter.reset()
+                    rebuilds = self.rebuilds
+                    start = time.perf_counter()
+                    self.press(event)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    syscalls = counter.total()
+                    for name, count in counter.counter.items():
+                        report.syscall_breakdown[name] = report.syscall_breakdown.get(name, 0) + count
+
+                    # async callbacks run off the UI thread in Sublime Text so they are reported separately
+                    counter.reset()
+                    start = time.perf_counter()
+                    self.sublime._drain_async()
+                    async_elapsed = (time.perf_counter() - start) * 1000
+                    stat = KeystrokeStat(repr(event), elapsed, syscalls, self.rebuilds - rebuilds, async_elapsed)
+                    report.keystrokes.append(stat)
+        finally:
+            counter.uninstall()
+
+        if expected := self.session.get("expect_text"):
+            if (actual := self.view.substr(self.sublime.Region(0, self.view.size()))) != expected:
+                report.violations.append(f"final text {actual!r} != expected {expected!r}")
+
+        return report
+
+
+def run_session(session: dict[str, Any], budget: dict[str, float] | None = None) -> SessionReport:
+    root = session.get("root") or tempfile.mkdtemp(prefix="afp-replay-")
+    try:
+        if not session.get("root"):
+            build_tree(root, session)
+        replayer = Replayer(session, root)
+        report = replayer.replay(SyscallCounter(PLUGIN_PACKAGE))
+    finally:
+        if not session.get("root"):
+            shutil.rmtree(root, ignore_errors=True)
+
+    report.check_budget({**session.get("budget", {}), **(budget or {})})
+    return report
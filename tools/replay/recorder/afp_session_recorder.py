@@ -0,0 +1,107 @@
+"""
+Records typing sessions for `python -m tools.replay`.
+
+Copy this file into your `Packages/User/` directory, then run the `afp_record_start` command in a view,
+type as usual and run `afp_record_stop`. The session is opened in a new view as JSON. It replays against the
+recorded project folder via `root`; replace `root` with a `tree` to make the session self-contained.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+
+import sublime
+import sublime_plugin
+
+# view ID => session
+g_sessions: dict[int, dict[str, Any]] = {}
+
+# commands run by keys which the plugin binds, recorded as key presses
+KEY_COMMANDS = {
+    "left_delete": "backspace",
+    "reload_auto_complete": "backspace",
+    "insert_dimensions": "tab",
+    "commit_completion": "tab",
+}
+
+
+def caret_scope(view: sublime.View) -> str:
+    return view.scope_name(view.sel()[0].b).strip() if len(view.sel()) else ""
+
+
+def selection_points(view: sublime.View) -> list[Any]:
+    return [region.b if region.empty() else [region.a, region.b] for region in view.sel()]
+
+
+class AfpRecordStartCommand(sublime_plugin.TextCommand):
+    def run(self, edit: sublime.Edit) -> None:
+        view = self.view
+        window = view.window()
+        file_name = view.file_name() or ""
+        root = next((f for f in (window.folders() if window else []) if file_name.startswith(f)), "")
+
+        g_sessions[view.id()] = {
+            "root": root,
+            "file": os.path.relpath(file_name, root) if root and file_name else file_name,
+            "text": view.substr(sublime.Region(0, view.size())),
+            "caret": selection_points(view),
+            "scope": view.scope_name(0).split(" ")[0],
+            "settings": {},
+            "events": [],
+            "_selection": selection_points(view),
+            "_command": "",
+        }
+        sublime.status_message("AutoFilePath: recording...")
+
+
+class AfpRecordStopCommand(sublime_plugin.TextCommand):
+    def run(self, edit: sublime.Edit) -> None:
+        if not (session := g_sessions.pop(self.view.id(), None)):
+            return
+
+        for key in tuple(session):
+            if key.startswith("_"):
+                del session[key]
+
+        if window := self.view.window():
+            output = window.new_file()
+            output.set_name("afp-session.json")
+            output.assign_syntax("scope:source.json")
+            output.run_command("append", {"characters": json.dumps(session, indent=4, ensure_ascii=False)})
+
+
+class AfpSessionRecorder(sublime_plugin.EventListener):
+    def on_text_command(self, view: sublime.View, command_name: str, args: dict[str, Any] | None) -> None:
+        if not (session := g_sessions.get(view.id())):
+            return
+
+        if command_name == "insert" and args:
+            session["events"].append({"insert": args.get("characters", ""), "scope": caret_scope(view)})
+        elif key := KEY_COMMANDS.get(command_name):
+            session["events"].append({"key": key, "scope": caret_scope(view)})
+        elif command_name in ("afp_show_filenames", "auto_complete"):
+            session["events"].append({"command": command_name, "scope": caret_scope(view)})
+        session["_command"] = command_name
+
+    def on_post_text_command(self, view: sublime.View, command_name: str, args: dict[str, Any] | None) -> None:
+        if not (session := g_sessions.get(view.id())):
+            return
+
+        # the committed completion is only known after it has been inserted
+        if command_name in ("insert_dimensions", "commit_completion") and session["events"]:
+            caret = view.sel()[0].b
+            session["events"][-1]["commit"] = view.substr(sublime.Region(view.word(caret).a, caret))
+
+        session["_command"] = ""
+        session["_selection"] = selection_points(view)
+
+    def on_selection_modified(self, view: sublime.View) -> None:
+        if not (session := g_sessions.get(view.id())) or session["_command"]:
+            return
+
+        # caret moves which are not caused by typing
+        if (selection := selection_points(view)) != session["_selection"]:
+            session["events"].append({"select": selection, "scope": caret_scope(view)})
+            session["_selection"] = selection
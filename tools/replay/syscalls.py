@@ -0,0 +1,120 @@
+"""An instrumented `os` shim which counts filesystem calls made by the plugin modules."""
+
+from __future__ import annotations
+
+import builtins
+import os
+import sys
+from collections import Counter
+from types import ModuleType
+from typing import Any, Callable
+
+# functions which hit the filesystem
+COUNTED_OS_FUNCS = ("listdir", "scandir", "stat", "lstat", "walk", "readlink", "access")
+COUNTED_PATH_FUNCS = ("exists", "lexists", "isdir", "isfile", "islink", "getsize", "getmtime", "realpath", "samefile")
+# functions which issue a varying number of syscalls per call (a `scandir` per directory, an `lstat` per
+# path component...) and are counted once per call, labelled as such
+COMPOSITE_FUNCS = ("walk", "realpath")
+
+
+class _Proxy(ModuleType):
+    def __init__(self, target: ModuleType, counted: tuple[str, ...], counter: Counter[str], prefix: str) -> None:
+        super().__init__(target.__name__)
+        self._target = target
+        self._counted = counted
+        self._counter = counter
+        self._prefix = prefix
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._target, name)
+        if name == "scandir":
+            return _counting_scandir(value, self._counter)
+        if name in self._counted:
+            label = f"{self._prefix}{name}" + (" (calls)" if name in COMPOSITE_FUNCS else "")
+            return _counting(value, label, self._counter)
+        return value
+
+
+class _CountingDirEntry:
+    """`os.DirEntry` only hits the filesystem in `stat()`, and in `is_*()` for symlinks or unknown file types."""
+
+    def __init__(self, entry: os.DirEntry, counter: Counter[str]) -> None:
+        self._entry = entry
+        self._counter = counter
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._entry, name)
+        if name == "stat":
+            return _counting(value, "DirEntry.stat", self._counter)
+        return value
+
+
+class _CountingScandir:
+    def __init__(self, iterator: Any, counter: Counter[str]) -> None:
+        self._iterator = iterator
+        self._counter = counter
+
+    def __iter__(self) -> _CountingScandir:
+        return self
+
+    def __next__(self) -> _CountingDirEntry:
+        return _CountingDirEntry(next(self._iterator), self._counter)
+
+    def __enter__(self) -> _CountingScandir:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._iterator.close()
+
+
+def _counting_scandir(func: Callable[..., Any], counter: Counter[str]) -> Callable[..., Any]:
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        counter["os.scandir"] += 1
+        return _CountingScandir(func(*args, **kwargs), counter)
+
+    return wrapper
+
+
+def _counting(func: Callable[..., Any], name: str, counter: Counter[str]) -> Callable[..., Any]:
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        counter[name] += 1
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+class SyscallCounter:
+    """Replaces the `os` and `open` names in the given modules with counting proxies."""
+
+    def __init__(self, module_prefix: str) -> None:
+        self.module_prefix = module_prefix
+        self.counter: Counter[str] = Counter()
+        self._os = _Proxy(os, COUNTED_OS_FUNCS, self.counter, "os.")
+        self._os.path = _Proxy(os.path, COUNTED_PATH_FUNCS, self.counter, "os.path.")  # type: ignore[attr-defined]
+        self._open = _counting(builtins.open, "open", self.counter)
+        self._patched: list[ModuleType] = []
+
+    def install(self) -> None:
+        for name, module in tuple(sys.modules.items()):
+            if not (name == self.module_prefix or name.startswith(f"{self.module_prefix}.")) or not module:
+                continue
+            if getattr(module, "os", None) is os:
+                module.os = self._os  # type: ignore[attr-defined]
+            module.open = self._open  # type: ignore[attr-defined]
+            self._patched.append(module)
+
+    def uninstall(self) -> None:
+        for module in self._patched:
+            if getattr(module, "os", None) is self._os:
+                module.os = os  # type: ignore[attr-defined]
+            vars(module).pop("open", None)
+        self._patched.clear()
+
+    def total(self) -> int:
+        return sum(self.counter.values())
+
+    def reset(self) -> None:
+        self.counter.clear()